@@ -24,13 +24,18 @@ Notes:
 
 from __future__ import annotations
 
+import asyncio
+import bisect
 import json
 import math
 import random
 import subprocess
-import threading
 import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -50,12 +55,16 @@ COOKIE_RESTITUTION = 0.10
 FRICTION_AIR = 0.985
 FRICTION_WATER = 0.965
 MAX_COOKIES = 260
+MAX_COOKIE_R = 18.0
 
 # Stability tuning
 SLEEP_SPEED = 22.0
+SLEEP_SPEED_SQ = SLEEP_SPEED * SLEEP_SPEED
+WAKE_OVERLAP = 0.6  # overlap (px) that wakes sleeping cookies
 SLEEP_FRAMES = 18
 COLLISION_PASSES = 2
 SUBSTEPS = 2
+GRID_CELL = 2.0 * MAX_COOKIE_R  # broad-phase cell: touching cookies are always in adjacent cells
 
 # Fill thresholds
 OVERFLOW_AT = 0.95
@@ -75,16 +84,26 @@ WOBBLE_DAMP = 0.10
 # Cookie 3D look
 HIGHLIGHT_SCALE = 0.36
 HIGHLIGHT_OFFSET = (-0.28, -0.28)
+_HL_OX, _HL_OY = HIGHLIGHT_OFFSET
 HIGHLIGHT_ALPHA_SIM = 0.72
 OUTLINE_COLOR = "#2a2a2a"
 SHADOW_COLOR = "#d9d9d9"
 
+# Stats / Defender labels are repainted at most this often (ms)
+UI_REFRESH_MS = 200
+
 # Defender polling
 DEFENDER_POLL_SECONDS = 4.0
+DEFENDER_POLL_MAX_SECONDS = 60.0  # idle polls back off exponentially up to this
+DEFENDER_THREAT_REFRESH_SECONDS = 60.0  # re-list detections at least this often
 MAX_DROPS_PER_TICK = 6  # prevents huge bursts freezing UI
+ASYNC_PUMP_BUDGET_S = 0.004  # per-frame time for Defender I/O on the Tk thread
+
+# Forward half of the 8-neighbourhood, so each adjacent cell pair is visited once
+_FORWARD_CELLS = ((1, -1), (1, 0), (1, 1), (0, 1))
 
 
-@dataclass
+@dataclass(slots=True)
 class CookieBody:
     color_name: str
     r: float
@@ -95,13 +114,17 @@ class CookieBody:
     item_id: int
     shadow_id: int
     highlight_id: int
+    tag: str
+    drawn_x: int
+    drawn_y: int
     asleep: bool = False
     sleep_counter: int = 0
     underwater: bool = False
     wobble_phase: float = 0.0
-    wobble_freq: float = 1.0
+    wobble_omega: float = math.tau  # angular wobble frequency, rad/s
 
 
+@lru_cache(maxsize=128)
 def safe_fg(bg: str) -> str:
     dark = {"black", "brown", "purple", "blue", "red", "magenta"}
     return "white" if bg.lower() in dark else "black"
@@ -116,6 +139,7 @@ def gray(level: int) -> str:
     return f"#{level:02x}{level:02x}{level:02x}"
 
 
+@lru_cache(maxsize=128)
 def rgb_to_hex(rgb: tuple[int, int, int]) -> str:
     r, g, b = (int(clamp(rgb[0], 0, 255)), int(clamp(rgb[1], 0, 255)), int(clamp(rgb[2], 0, 255)))
     return f"#{r:02x}{g:02x}{b:02x}"
@@ -153,6 +177,7 @@ COLOR_RGB: dict[str, tuple[int, int, int]] = {
 }
 
 
+@lru_cache(maxsize=128)
 def underwater_color(name: str) -> str:
     base = COLOR_RGB.get(name.lower(), (180, 180, 180))
     dark = (base[0] * UNDERWATER_DARKEN, base[1] * UNDERWATER_DARKEN, base[2] * UNDERWATER_DARKEN)
@@ -164,6 +189,7 @@ def underwater_color(name: str) -> str:
     return rgb_to_hex((int(tint[0]), int(tint[1]), int(tint[2])))
 
 
+@lru_cache(maxsize=128)
 def highlight_color(fill_hex_or_name: str) -> str:
     if fill_hex_or_name.startswith("#"):
         base = hex_to_rgb(fill_hex_or_name)
@@ -227,25 +253,16 @@ class EllipseBowlCollider:
         self._rim_right = self.cx + dx
 
     def _recalc_area(self) -> None:
-        samples_x = 140
-        samples_y = 180
-        x0 = self.cx - self.a
-        x1 = self.cx + self.a
-        y0 = self.rim_y
-        y1 = self.cy + self.b
-        dx = (x1 - x0) / samples_x
-        dy = (y1 - y0) / samples_y
-
-        inside = 0
-        total = samples_x * samples_y
-        for iy in range(samples_y):
-            y = y0 + (iy + 0.5) * dy
-            for ix in range(samples_x):
-                x = x0 + (ix + 0.5) * dx
-                if self.is_inside_point(x, y):
-                    inside += 1
-        rect_area = (x1 - x0) * (y1 - y0)
-        self._bowl_area = max(1.0, rect_area * (inside / total))
+        # Closed-form area of the ellipse below the rim line (y >= rim_y).
+        d = (self.rim_y - self.cy) / self.b
+        if d <= -1.0:
+            area = math.pi * self.a * self.b
+        elif d >= 1.0:
+            area = 0.0
+        else:
+            theta = math.acos(d)
+            area = self.a * self.b * (theta - math.sin(theta) * math.cos(theta))
+        self._bowl_area = max(1.0, area)
 
     @property
     def rim_left(self) -> float:
@@ -308,46 +325,200 @@ class EllipseBowlCollider:
             c.x = self.opening_clamp_x(c.x, c.r)
 
 
-def run_powershell_json(command: str, timeout: float = 6.0) -> Any:
-    completed = subprocess.run(
-        ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", command],
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-    )
-    if completed.returncode != 0:
-        raise RuntimeError((completed.stderr or completed.stdout or "").strip() or "PowerShell error")
-    out = (completed.stdout or "").strip()
-    if not out:
-        return None
-    return json.loads(out)
-
-
-def fetch_defender_snapshot() -> dict[str, Any]:
-    status_cmd = (
-        "Get-MpComputerStatus | "
-        "Select-Object AMServiceEnabled,AntivirusEnabled,RealTimeProtectionEnabled,"
-        "BehaviorMonitorEnabled,IoavProtectionEnabled,AntispywareEnabled,IsTamperProtected,"
-        "SignatureAge,EngineVersion,AntivirusSignatureVersion | "
-        "ConvertTo-Json -Depth 3"
-    )
-    threats_cmd = (
-        "Get-MpThreatDetection | "
-        "Select-Object ThreatName,SeverityID,Severity,ActionSuccess,DetectionTime,Resources | "
-        "ConvertTo-Json -Depth 5"
-    )
+# Equal-mass impulse factor: j = -(1 + e) * vel_n / 2.
+_NEG_HALF_ONE_PLUS_E = -0.5 * (1.0 + COOKIE_RESTITUTION)
+
+# Push shares for (a, b) keyed by (a.asleep, b.asleep); the broad phase never pairs two sleepers.
+_PUSH_SPLIT = {
+    (False, False): (0.5, 0.5),
+    (True, False): (0.0, 1.0),
+    (False, True): (1.0, 0.0),
+}
 
-    status = run_powershell_json(status_cmd)
-    threats = run_powershell_json(threats_cmd)
 
-    if threats is None:
-        threats_list: list[dict[str, Any]] = []
-    elif isinstance(threats, list):
-        threats_list = threats
-    else:
-        threats_list = [threats]
+def resolve_circle_collision(a: CookieBody, b: CookieBody) -> None:
+    dx = b.x - a.x
+    dy = b.y - a.y
+    dist2 = dx * dx + dy * dy
+    min_dist = a.r + b.r
+
+    if dist2 <= 1e-9:
+        # Coincident centres: any direction separates them, so use a fixed one.
+        dx = 0.01
+        dy = 0.0
+        dist2 = 1e-4
+
+    if dist2 >= min_dist * min_dist:
+        return
+
+    a_asleep = a.asleep
+    b_asleep = b.asleep
+
+    # One sqrt and one divide; the normal and distance reuse the reciprocal.
+    inv = 1.0 / math.sqrt(dist2)
+    nx = dx * inv
+    ny = dy * inv
+    overlap = min_dist - dist2 * inv
+
+    push_a, push_b = _PUSH_SPLIT[a_asleep, b_asleep]
+    a.x -= nx * overlap * push_a
+    a.y -= ny * overlap * push_a
+    b.x += nx * overlap * push_b
+    b.y += ny * overlap * push_b
+
+    if overlap > WAKE_OVERLAP:
+        a.asleep = a_asleep = False
+        b.asleep = b_asleep = False
+        a.sleep_counter = 0
+        b.sleep_counter = 0
+
+    rvx = b.vx - a.vx
+    rvy = b.vy - a.vy
+    vel_n = rvx * nx + rvy * ny
+    if vel_n > 0:
+        return
+
+    k = _NEG_HALF_ONE_PLUS_E * vel_n
+    ix = k * nx
+    iy = k * ny
+
+    if not a_asleep:
+        a.vx -= ix
+        a.vy -= iy
+    if not b_asleep:
+        b.vx += ix
+        b.vy += iy
+
+
+def resolve_contacts(pairs: list[tuple[CookieBody, CookieBody]]) -> None:
+    """Narrow phase over broad-phase candidates; only touching pairs pay for a call."""
+    resolve = resolve_circle_collision
+    for a, b in pairs:
+        dx = b.x - a.x
+        dy = b.y - a.y
+        rr = a.r + b.r
+        if dx * dx + dy * dy < rr * rr:
+            resolve(a, b)
+
+
+class PSHost:
+    """One long-lived PowerShell process; each reply ends with a marker line."""
+
+    END_MARKER = "__END__"
+    ERROR_MARKER = "__ERROR__"
+    LINE_LIMIT = 1 << 20  # one compressed detection record per line
+
+    def __init__(self, timeout: float = 6.0) -> None:
+        self.timeout = timeout
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        if self._proc is not None and self._proc.returncode is not None:
+            await self.close()
+        if self._proc is None:
+            self._proc = await asyncio.create_subprocess_exec(
+                "powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", "-",
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                limit=self.LINE_LIMIT,
+                # The windowed build would otherwise give the host its own console.
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+        return self._proc
 
-    return {"status": status, "threats": threats_list, "fetched_at": datetime.now().isoformat(timespec="seconds")}
+    async def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        if proc.returncode is None:
+            proc.kill()
+        # Close stdin and reap the process so its pipes and transport are released.
+        if proc.stdin is not None:
+            proc.stdin.close()
+        await proc.wait()
+
+    async def _reply_lines(self, command: str) -> AsyncIterator[str]:
+        """Send one command and yield its output lines up to the end marker."""
+        # Errors are reported on stdout before the end marker, so stderr is never read.
+        script = (
+            f"try {{ $ErrorActionPreference = 'Stop'; {command} }} "
+            f"catch {{ Write-Output ('{self.ERROR_MARKER}' + $_) }}; "
+            f"Write-Host '{self.END_MARKER}'\n"
+        )
+        async with self._lock:
+            proc = await self._ensure_started()
+            assert proc.stdin is not None and proc.stdout is not None
+            finished = False
+            try:
+                proc.stdin.write(script.encode("utf-8"))
+                await proc.stdin.drain()
+                while True:
+                    try:
+                        raw = await asyncio.wait_for(proc.stdout.readline(), self.timeout)
+                    except TimeoutError as e:
+                        raise RuntimeError("PowerShell query timed out") from e
+                    if not raw:
+                        raise RuntimeError("PowerShell host exited")
+                    line = raw.decode("utf-8", errors="replace")
+                    if line.rstrip() == self.END_MARKER:
+                        finished = True
+                        return
+                    if line.startswith(self.ERROR_MARKER):
+                        raise RuntimeError(line[len(self.ERROR_MARKER):].strip() or "PowerShell error")
+                    yield line
+            except (OSError, ValueError) as e:
+                raise RuntimeError(f"PowerShell host failed: {e}") from e
+            finally:
+                if not finished:
+                    # Reply not read to its marker: the pipe is out of sync, start over.
+                    await self.close()
+
+    async def query(self, command: str) -> Any:
+        async with aclosing(self._reply_lines(command)) as lines:
+            out = "".join([line async for line in lines]).strip()
+        if not out:
+            return None
+        return json.loads(out)
+
+    async def stream(self, command: str) -> AsyncIterator[Any]:
+        """Yield one parsed value per output line (pair with ConvertTo-Json -Compress)."""
+        async with aclosing(self._reply_lines(command)) as lines:
+            async for line in lines:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+_STATUS_SELECT = (
+    "Get-MpComputerStatus | "
+    "Select-Object AMServiceEnabled,AntivirusEnabled,RealTimeProtectionEnabled,"
+    "BehaviorMonitorEnabled,IoavProtectionEnabled,AntispywareEnabled,IsTamperProtected,"
+    "SignatureAge,EngineVersion,AntivirusSignatureVersion,RealTimeScanDirection,"
+    "QuickScanEndTime,FullScanEndTime,AntivirusSignatureLastUpdated"
+)
+_THREATS_STREAM = (
+    "Get-MpThreatDetection | "
+    "Select-Object ThreatName,SeverityID,Severity,ActionSuccess,DetectionTime,Resources | "
+    "ForEach-Object { ConvertTo-Json -InputObject $_ -Depth 5 -Compress }"
+)
+
+
+async def fetch_defender_status(host: PSHost) -> dict[str, Any]:
+    return await host.query(f"{_STATUS_SELECT} | ConvertTo-Json -Depth 3 -Compress") or {}
+
+
+def stream_defender_threats(host: PSHost) -> AsyncIterator[dict[str, Any]]:
+    """One JSON record per detection, parsed as it arrives."""
+    return host.stream(_THREATS_STREAM)
+
+
+def stream_defender_snapshot(host: PSHost) -> AsyncIterator[Any]:
+    """Status record (or None) first, then one record per detection, in a single reply."""
+    return host.stream(
+        f"ConvertTo-Json -InputObject ({_STATUS_SELECT}) -Depth 3 -Compress; {_THREATS_STREAM}"
+    )
 
 
 class App:
@@ -370,6 +541,12 @@ class App:
 
         self.cookies: list[CookieBody] = []
         self.counts: dict[str, int] = {}
+        self._total_area = 0.0  # running sum of pi * r^2 over self.cookies
+        self._cookie_seq = 0
+        self._item_pool: list[tuple[str, int, int, int]] = []
+        self._grid: defaultdict[tuple[int, int], list[CookieBody]] = defaultdict(list)
+        self._recolor: list[CookieBody] = []  # crossed the waterline; _render repaints them
+        self._at_rest = False  # every cookie asleep: _loop skips the step until something wakes
 
         self.auto_enabled = tk.BooleanVar(value=False)
         self.auto_rate = tk.DoubleVar(value=3.0)
@@ -380,21 +557,37 @@ class App:
         # Defender auto-drop
         self.def_auto_drop = tk.BooleanVar(value=True)
         self.def_poll = tk.BooleanVar(value=True)
-        self._defender_lock = threading.Lock()
-        self._defender_last_ids: set[str] = set()
+        self.def_poll.trace_add("write", self._on_def_poll_toggled)
+        self._defender_last_ids: set[int] = set()
         self._defender_pending_colors: list[str] = []
-        self._defender_last_error: str = ""
-        self._defender_status_text: str = "Not checked yet"
+        # (status_text, last_error, last_fetch), replaced as a whole on every publish.
+        self._defender_snapshot: tuple[str, str, str] = ("Not checked yet", "", "")
         self._defender_total: int = 0
-        self._defender_last_fetch: str = ""
-
-        self._last_t = time.perf_counter()
+        self._defender_ui_shown: Optional[tuple[str, str, int, str]] = None
+        # Defender I/O runs as asyncio tasks on this thread; _loop pumps the loop.
+        self._aio = asyncio.new_event_loop()
+        self._aio_tasks: set[asyncio.Task[Any]] = set()
+        self._ps_host = PSHost()
+        self._defender_inflight = False
+        self._poll_interval = DEFENDER_POLL_SECONDS
+        self._idle_count = 0
+        self._poll_after_id: Optional[str] = None
+        self._last_scan_end: Optional[tuple[Any, Any]] = None
+        self._last_threat_fetch = 0.0
+
+        self._last_t_ns = time.monotonic_ns()
         self._sim_t = 0.0
+        self._last_stats_ms = 0
+        self._last_defender_ui_ms = 0
+        self._stats_dirty = False
+        self._shown_counts: dict[str, int] = {}
+        self._sorted_colors: list[str] = []  # keys of self.counts, kept sorted on spawn
 
         self._build_ui()
         self._draw_bowl()
+        self._fill_item_pool()
 
-        self._start_defender_thread()
+        self._start_defender_polling()
         self._loop()
 
     def _build_ui(self) -> None:
@@ -474,6 +667,7 @@ class App:
         self.canvas = tk.Canvas(center, width=self.canvas_w, height=self.canvas_h, bg="white",
                                 highlightthickness=1, highlightbackground="#dddddd")
         self.canvas.grid(row=0, column=0)
+        self._canvas_path = str(self.canvas)  # Tcl command name, for batched scripts
 
         right = ttk.Frame(outer)
         right.grid(row=1, column=2, sticky="ns", padx=(10, 0))
@@ -548,46 +742,100 @@ class App:
         self.canvas.tag_lower("bowl")
 
     # ---------- Defender ----------
-    def _start_defender_thread(self) -> None:
-        t = threading.Thread(target=self._defender_loop, daemon=True)
-        t.start()
+    def _start_defender_polling(self) -> None:
+        self._poll_after_id = self.root.after(0, self._kick_defender_poll)
+
+    def _run_async(self, coro: Any) -> None:
+        task = self._aio.create_task(coro)
+        self._aio_tasks.add(task)
+        task.add_done_callback(self._aio_tasks.discard)
+
+    def _pump_async(self) -> None:
+        # Run non-blocking passes of the asyncio loop until it is idle or the budget is spent.
+        loop = self._aio
+        deadline = time.perf_counter() + ASYNC_PUMP_BUDGET_S
+        while True:
+            loop.call_soon(loop.stop)
+            loop.run_forever()
+            if not loop._ready or time.perf_counter() >= deadline:  # no public "is idle"
+                break
 
     def sync_defender_now(self) -> None:
-        threading.Thread(target=self._defender_sync_once, daemon=True).start()
+        if self._defender_inflight:
+            return
+        self._run_async(self._defender_sync_once(force=True))
+
+    def _kick_defender_poll(self) -> None:
+        self._poll_after_id = None
+        self._run_async(self._defender_poll())
+
+    def _on_def_poll_toggled(self, *_: Any) -> None:
+        if self.def_poll.get():
+            self._reset_poll_backoff()
+
+    def _reset_poll_backoff(self) -> None:
+        self._idle_count = 0
+        self._poll_interval = DEFENDER_POLL_SECONDS
+        # Pull a waiting poll forward; a running one reschedules itself when done.
+        if self._poll_after_id is not None:
+            self.root.after_cancel(self._poll_after_id)
+            self._poll_after_id = self.root.after(
+                int(self._poll_interval * 1000), self._kick_defender_poll
+            )
 
-    def _defender_loop(self) -> None:
-        while True:
-            try:
-                if self.def_poll.get():
-                    self._defender_sync_once()
-            except Exception:
-                pass
-            time.sleep(DEFENDER_POLL_SECONDS)
+    async def _defender_poll(self) -> None:
+        new_count = None
+        try:
+            if self.def_poll.get():
+                new_count = await self._defender_sync_once()
+        except Exception:
+            pass
+        # Back off while syncs find nothing new; _defender_sync_once resets it on fresh detections.
+        if new_count == 0:
+            self._idle_count += 1
+            self._poll_interval = min(
+                DEFENDER_POLL_MAX_SECONDS, DEFENDER_POLL_SECONDS * (2 ** min(self._idle_count, 4))
+            )
+        self._poll_after_id = self.root.after(
+            int(self._poll_interval * 1000), self._kick_defender_poll
+        )
 
-    def _defender_sync_once(self) -> None:
+    async def _defender_sync_once(self, force: bool = False) -> Optional[int]:
+        """Fetch and publish one snapshot; returns the new detection count, None if skipped."""
+        # Collapse overlapping syncs (manual button vs. poll) into one.
+        if self._defender_inflight:
+            return None
+        self._defender_inflight = True
         try:
-            snap = fetch_defender_snapshot()
-            threats = snap.get("threats", [])
-            status = snap.get("status", {}) or {}
-            fetched_at = snap.get("fetched_at", "")
+            new_count = await self._defender_fetch_and_publish(force)
+        finally:
+            self._defender_inflight = False
+        if new_count:
+            self._reset_poll_backoff()
+        return new_count
+
+    async def _defender_fetch_and_publish(self, force: bool = False) -> int:
+        try:
+            # A due re-list goes out in the same reply as the status.
+            now = time.monotonic()
+            listing: Optional[tuple[int, set[int], list[str]]] = None
+            if force or now - self._last_threat_fetch >= DEFENDER_THREAT_REFRESH_SECONDS:
+                async with aclosing(stream_defender_snapshot(self._ps_host)) as replies:
+                    status = await anext(replies, None) or {}
+                    listing = await self._read_detections(replies)
+            else:
+                status = await fetch_defender_status(self._ps_host)
+            fetched_at = datetime.now().isoformat(timespec="seconds")
 
-            # Build stable ids for detections (best-effort)
-            new_colors: list[str] = []
-            current_ids: set[str] = set()
-
-            for t in threats:
-                name = str(t.get("ThreatName", "") or "")
-                det_time = str(t.get("DetectionTime", "") or "")
-                sev_id = t.get("SeverityID", None)
-                sev_txt = t.get("Severity", None)
-                res = t.get("Resources", "")
-                rid = f"{name}|{det_time}|{sev_id}|{res}"
-                current_ids.add(rid)
-                if rid not in self._defender_last_ids:
-                    new_colors.append(defender_severity_to_cookie_color(
-                        int(sev_id) if isinstance(sev_id, (int, float)) else None,
-                        str(sev_txt) if sev_txt is not None else None,
-                    ))
+            scan_end = (status.get("QuickScanEndTime"), status.get("FullScanEndTime"))
+            if listing is None and scan_end != self._last_scan_end:
+                async with aclosing(stream_defender_threats(self._ps_host)) as threats:
+                    listing = await self._read_detections(threats)
+
+            if listing is None:
+                total, new_ids, new_colors = self._defender_total, set(), []
+            else:
+                total, new_ids, new_colors = listing
 
             am_on = bool(status.get("AMServiceEnabled", False))
             av_on = bool(status.get("AntivirusEnabled", False))
@@ -595,34 +843,73 @@ class App:
             sig_age = status.get("SignatureAge", None)
             ver = status.get("AntivirusSignatureVersion", None)
 
-            status_line = f"Status: AM={am_on} AV={av_on} RTP={rtp} | Detections={len(threats)}"
+            status_line = f"Status: AM={am_on} AV={av_on} RTP={rtp} | Detections={total}"
             if sig_age is not None:
                 status_line += f" | SigAge={sig_age}"
             if ver is not None:
                 status_line += f" | SigVer={ver}"
 
-            with self._defender_lock:
-                self._defender_last_error = ""
-                self._defender_status_text = status_line
-                self._defender_total = len(threats)
-                self._defender_last_fetch = fetched_at
-                self._defender_last_ids = current_ids
-                if new_colors:
-                    self._defender_pending_colors.extend(new_colors)
+            self._defender_snapshot = (status_line, "", fetched_at)
+            self._defender_total = total
+            # Only remember the listing once it has been read successfully.
+            self._defender_last_ids.update(new_ids)
+            if new_colors:
+                self._defender_pending_colors.extend(new_colors)
+            self._last_scan_end = scan_end
+            if listing is not None:
+                self._last_threat_fetch = now
+            return len(new_colors)
 
         except Exception as e:
-            with self._defender_lock:
-                self._defender_last_error = str(e)
-                self._defender_status_text = "Status: Error reading Defender (see right panel)"
-                self._defender_last_fetch = datetime.now().isoformat(timespec="seconds")
+            self._defender_snapshot = (
+                "Status: Error reading Defender (see right panel)",
+                str(e),
+                datetime.now().isoformat(timespec="seconds"),
+            )
+            return 0
+
+    async def _read_detections(
+        self, threats: AsyncIterator[Any]
+    ) -> tuple[int, set[int], list[str]]:
+        """Count a detection listing; returns (total, unseen ids, their colours)."""
+        seen_ids = self._defender_last_ids
+        new_ids: set[int] = set()
+        new_colors: list[str] = []
+        total = 0
+        async for t in threats:
+            total += 1
+            name = str(t.get("ThreatName", "") or "")
+            det_time = str(t.get("DetectionTime", "") or "")
+            sev_id = t.get("SeverityID", None)
+            sev_txt = t.get("Severity", None)
+            res = t.get("Resources", "")
+            if isinstance(res, list):
+                res = tuple(res)
+            # Build stable ids for detections (best-effort)
+            rid = hash((name, det_time, sev_id, res))
+            if rid not in seen_ids and rid not in new_ids:
+                new_ids.add(rid)
+                new_colors.append(defender_severity_to_cookie_color(
+                    int(sev_id) if isinstance(sev_id, (int, float)) else None,
+                    str(sev_txt) if sev_txt is not None else None,
+                ))
+        return total, new_ids, new_colors
+
+    def shutdown(self) -> None:
+        loop = self._aio
+        tasks = list(self._aio_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(self._ps_host.close())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
 
     # ---------- Cookies ----------
     def _cookie_fill(self, c: CookieBody) -> str:
         return underwater_color(c.color_name) if c.underwater else c.color_name
 
-    def _highlight_fill(self, c: CookieBody) -> str:
-        return highlight_color(self._cookie_fill(c))
-
     def spawn_cookie(self, color: str) -> None:
         ratio = self._fill_ratio()
         if ratio >= HARD_STOP_AT:
@@ -632,47 +919,76 @@ class App:
             self.status.config(text="Too many cookies for stability. Clear or export.")
             return
 
-        r = random.uniform(11.0, 18.0)
-        x = random.uniform(self.collider.rim_left + r + 10, self.collider.rim_right - r - 10)
-        y = self.collider.rim_y - r - random.uniform(45.0, 120.0)
-        vx = random.uniform(-240.0, 240.0)
-        vy = random.uniform(-40.0, 120.0)
-
-        shadow_id = self.canvas.create_oval(
-            int(x - r * 0.92), int((y + r * 0.60) - r * 0.18),
-            int(x + r * 0.92), int((y + r * 0.60) + r * 0.18),
-            fill=SHADOW_COLOR, outline="", tags="cookie"
-        )
-        item_id = self.canvas.create_oval(
-            int(x - r), int(y - r), int(x + r), int(y + r),
-            fill=color, outline=OUTLINE_COLOR, width=1, tags="cookie"
-        )
-        hr = r * HIGHLIGHT_SCALE
-        hx = x + HIGHLIGHT_OFFSET[0] * r
-        hy = y + HIGHLIGHT_OFFSET[1] * r
-        highlight_id = self.canvas.create_oval(
-            int(hx - hr), int(hy - hr), int(hx + hr), int(hy + hr),
-            fill=highlight_color(color), outline="", tags="cookie"
-        )
+        rand = random.random
+        r = 11.0 + (MAX_COOKIE_R - 11.0) * rand()
+        x_lo = self.collider.rim_left + r + 10
+        x = x_lo + (self.collider.rim_right - r - 10 - x_lo) * rand()
+        y = self.collider.rim_y - r - (45.0 + 75.0 * rand())
+        vx = -240.0 + 480.0 * rand()
+        vy = -40.0 + 160.0 * rand()
+
+        if not self._item_pool:
+            self._item_pool.append(self._create_cookie_items())
+        tag, shadow_id, item_id, highlight_id = self._item_pool.pop()
+
+        # Whole-pixel boxes around the rounded centre, matching _render's rounding.
+        canvas = self.canvas
+        ix = round(x)
+        iy = round(y)
+        ir = round(r)
+        sw = round(r * 0.92)
+        sh = round(r * 0.18)
+        sy = iy + round(r * 0.60)
+        canvas.coords(shadow_id, ix - sw, sy - sh, ix + sw, sy + sh)
+        canvas.coords(item_id, ix - ir, iy - ir, ix + ir, iy + ir)
+        hr = round(r * HIGHLIGHT_SCALE)
+        hx = ix + round(_HL_OX * r)
+        hy = iy + round(_HL_OY * r)
+        canvas.coords(highlight_id, hx - hr, hy - hr, hx + hr, hy + hr)
+        canvas.itemconfigure(item_id, fill=color)
+        canvas.itemconfigure(highlight_id, fill=highlight_color(color))
+        canvas.itemconfigure(tag, state="normal")
 
         c = CookieBody(
             color_name=color, r=r, x=x, y=y, vx=vx, vy=vy,
             item_id=item_id, shadow_id=shadow_id, highlight_id=highlight_id,
-            wobble_phase=random.random() * math.tau,
-            wobble_freq=random.uniform(WOBBLE_FREQ_MIN, WOBBLE_FREQ_MAX),
+            tag=tag, drawn_x=ix, drawn_y=iy,
+            wobble_phase=rand() * math.tau,
+            wobble_omega=math.tau * (WOBBLE_FREQ_MIN + (WOBBLE_FREQ_MAX - WOBBLE_FREQ_MIN) * rand()),
         )
 
         self.cookies.append(c)
+        self._at_rest = False
+        self._total_area += math.pi * r * r
+        if color not in self.counts:
+            bisect.insort(self._sorted_colors, color)
         self.counts[color] = self.counts.get(color, 0) + 1
         self._refresh_stats()
 
+    def _create_cookie_items(self) -> tuple[str, int, int, int]:
+        # The three items share a per-cookie tag so _render can move them in one call.
+        self._cookie_seq += 1
+        tag = f"ck{self._cookie_seq}"
+        tags = ("cookie", tag)
+        shadow_id = self.canvas.create_oval(0, 0, 0, 0, fill=SHADOW_COLOR, outline="",
+                                            tags=tags, state="hidden")
+        item_id = self.canvas.create_oval(0, 0, 0, 0, fill="", outline=OUTLINE_COLOR, width=1,
+                                          tags=tags, state="hidden")
+        highlight_id = self.canvas.create_oval(0, 0, 0, 0, fill="", outline="",
+                                               tags=tags, state="hidden")
+        return tag, shadow_id, item_id, highlight_id
+
+    def _fill_item_pool(self) -> None:
+        # Items for a full bowl up front; spawn_cookie reuses them, clear() hides them.
+        self._item_pool = [self._create_cookie_items() for _ in range(MAX_COOKIES)]
+        self._item_pool.reverse()
+
     def _apply_underwater_mode(self, c: CookieBody) -> None:
         is_under = c.y >= self.water_y
         if is_under == c.underwater:
             return
         c.underwater = is_under
-        self.canvas.itemconfigure(c.item_id, fill=self._cookie_fill(c))
-        self.canvas.itemconfigure(c.highlight_id, fill=self._highlight_fill(c))
+        self._recolor.append(c)
 
         if is_under:
             c.vx *= 0.78
@@ -682,37 +998,43 @@ class App:
 
     def _underwater_wobble_ax(self, c: CookieBody) -> float:
         speed = math.hypot(c.vx, c.vy)
-        fade = clamp(speed / (SLEEP_SPEED * 2.5), 0.0, 1.0)
-        wob = math.sin(c.wobble_phase + math.tau * c.wobble_freq * self._sim_t)
+        fade = min(speed / (SLEEP_SPEED * 2.5), 1.0)  # speed is never negative
+        wob = math.sin(c.wobble_phase + c.wobble_omega * self._sim_t)
         return WOBBLE_ACCEL * wob * fade
 
     # ---------- Actions ----------
     def shake(self) -> None:
+        rand = random.random
+        self._at_rest = False
         for c in self.cookies:
             c.asleep = False
             c.sleep_counter = 0
-            c.vx += random.uniform(-760.0, 760.0)
-            c.vy += random.uniform(-560.0, 220.0)
+            c.vx += -760.0 + 1520.0 * rand()
+            c.vy += -560.0 + 780.0 * rand()
 
     def clear(self) -> None:
-        self.canvas.delete("cookie")
+        self.canvas.itemconfigure("cookie", state="hidden")
+        self._item_pool.extend((c.tag, c.shadow_id, c.item_id, c.highlight_id) for c in self.cookies)
+        # Hand items out in creation order again so stacking follows drop order.
+        self._item_pool.sort(key=lambda group: group[2], reverse=True)
         self.cookies.clear()
+        self._total_area = 0.0
         self.counts.clear()
+        self._sorted_colors.clear()
         self._auto_accum = 0.0
-        with self._defender_lock:
-            self._defender_pending_colors.clear()
-        self._refresh_stats()
-        self._refresh_fill_meter()
+        self._defender_pending_colors.clear()
+        self._recolor.clear()
+        self._refresh_stats(force=True)
         self.status.config(text="")
 
     def export_json(self) -> None:
-        with self._defender_lock:
-            defender = {
-                "status_text": self._defender_status_text,
-                "last_error": self._defender_last_error,
-                "total_detections": self._defender_total,
-                "last_fetch": self._defender_last_fetch,
-            }
+        status_text, last_error, last_fetch = self._defender_snapshot
+        defender = {
+            "status_text": status_text,
+            "last_error": last_error,
+            "total_detections": self._defender_total,
+            "last_fetch": last_fetch,
+        }
 
         payload = {
             "exported_at": datetime.now().isoformat(timespec="seconds"),
@@ -727,16 +1049,20 @@ class App:
 
     # ---------- Loop / physics ----------
     def _loop(self) -> None:
-        now = time.perf_counter()
-        dt = min(now - self._last_t, 1 / 30)
-        self._last_t = now
+        now_ns = time.monotonic_ns()
+        dt = min((now_ns - self._last_t_ns) * 1e-9, 1 / 30)
+        self._last_t_ns = now_ns
         self._sim_t += dt
 
+        self._pump_async()
         self._auto_drop_step(dt)
         self._defender_drop_step()
-        self._step(dt)
+        if not self._at_rest:
+            self._step(dt)
         self._render()
         self._update_defender_ui()
+        if self._stats_dirty:
+            self._refresh_stats()
 
         self.root.after(16, self._loop)
 
@@ -763,145 +1089,125 @@ class App:
         if not self.def_auto_drop.get():
             return
         dropped = 0
-        with self._defender_lock:
-            while self._defender_pending_colors and dropped < MAX_DROPS_PER_TICK:
-                color = self._defender_pending_colors.pop(0)
-                self.spawn_cookie(color)
-                dropped += 1
+        while self._defender_pending_colors and dropped < MAX_DROPS_PER_TICK:
+            color = self._defender_pending_colors.pop(0)
+            self.spawn_cookie(color)
+            dropped += 1
 
     def _step(self, dt: float) -> None:
+        # No Tk calls here; _render sends the visual changes.
         sub_dt = dt / SUBSTEPS
+        # Per-substep constants, hoisted out of the per-cookie loop.
+        dv_air = GRAVITY_AIR * sub_dt
+        dv_water = GRAVITY_WATER * sub_dt
+        wobble_damp = 1.0 - WOBBLE_DAMP * sub_dt
+        apply_underwater = self._apply_underwater_mode
+        wobble_ax = self._underwater_wobble_ax
+        collide = self.collider.collide_cookie
         for _ in range(SUBSTEPS):
             for c in self.cookies:
-                self._apply_underwater_mode(c)
+                apply_underwater(c)
                 if c.asleep:
                     continue
 
-                gravity = GRAVITY_WATER if c.underwater else GRAVITY_AIR
-                friction = FRICTION_WATER if c.underwater else FRICTION_AIR
-
                 if c.underwater:
-                    c.vx += self._underwater_wobble_ax(c) * sub_dt
-                    c.vx *= (1.0 - WOBBLE_DAMP * sub_dt)
-
-                c.vy += gravity * sub_dt
-                c.x += c.vx * sub_dt
-                c.y += c.vy * sub_dt
-                c.vx *= friction
-                c.vy *= 0.999 if not c.underwater else 0.990
-
-                self.collider.collide_cookie(c)
+                    vx = (c.vx + wobble_ax(c) * sub_dt) * wobble_damp
+                    vy = c.vy + dv_water
+                    c.x += vx * sub_dt
+                    c.y += vy * sub_dt
+                    c.vx = vx * FRICTION_WATER
+                    c.vy = vy * 0.990
+                else:
+                    vx = c.vx
+                    vy = c.vy + dv_air
+                    c.x += vx * sub_dt
+                    c.y += vy * sub_dt
+                    c.vx = vx * FRICTION_AIR
+                    c.vy = vy * 0.999
+
+                collide(c)
 
             for _pass in range(COLLISION_PASSES):
-                n = len(self.cookies)
-                for i in range(n):
-                    a = self.cookies[i]
-                    for j in range(i + 1, n):
-                        b = self.cookies[j]
-                        self._resolve_circle_collision(a, b)
+                resolve_contacts(self._broad_phase_pairs())
 
+        rim_y = self.collider.rim_y
+        awake = 0
         for c in self.cookies:
             if c.asleep:
                 continue
-            speed = math.hypot(c.vx, c.vy)
-            if speed < SLEEP_SPEED and c.y > self.collider.rim_y + c.r:
-                c.sleep_counter += 1
-                if c.sleep_counter >= SLEEP_FRAMES:
+            vx = c.vx
+            vy = c.vy
+            if vx * vx + vy * vy < SLEEP_SPEED_SQ and c.y > rim_y + c.r:
+                counter = c.sleep_counter + 1
+                c.sleep_counter = counter
+                if counter >= SLEEP_FRAMES:
                     c.asleep = True
                     c.vx = 0.0
                     c.vy = 0.0
+                    continue
             else:
                 c.sleep_counter = 0
-
-        self._refresh_fill_meter()
-
-    def _resolve_circle_collision(self, a: CookieBody, b: CookieBody) -> None:
-        dx = b.x - a.x
-        dy = b.y - a.y
-        dist2 = dx * dx + dy * dy
-        min_dist = a.r + b.r
-
-        if dist2 <= 1e-9:
-            ang = random.random() * math.tau
-            dx = math.cos(ang) * 0.01
-            dy = math.sin(ang) * 0.01
-            dist2 = dx * dx + dy * dy
-
-        if dist2 >= min_dist * min_dist:
-            return
-
-        dist = math.sqrt(dist2)
-        nx = dx / dist
-        ny = dy / dist
-        overlap = (min_dist - dist)
-
-        if a.asleep and not b.asleep:
-            b.x += nx * overlap
-            b.y += ny * overlap
-        elif b.asleep and not a.asleep:
-            a.x -= nx * overlap
-            a.y -= ny * overlap
-        else:
-            push = overlap * 0.5
-            a.x -= nx * push
-            a.y -= ny * push
-            b.x += nx * push
-            b.y += ny * push
-
-        if overlap > 0.6:
-            a.asleep = False
-            b.asleep = False
-            a.sleep_counter = 0
-            b.sleep_counter = 0
-
-        rvx = b.vx - a.vx
-        rvy = b.vy - a.vy
-        vel_n = rvx * nx + rvy * ny
-        if vel_n > 0:
-            return
-
-        j = -(1.0 + COOKIE_RESTITUTION) * vel_n / 2.0
-        ix = j * nx
-        iy = j * ny
-
-        if not a.asleep:
-            a.vx -= ix
-            a.vy -= iy
-        if not b.asleep:
-            b.vx += ix
-            b.vy += iy
+            awake += 1
+        # Nothing moves again until spawn_cookie or shake.
+        self._at_rest = awake == 0
+
+    def _broad_phase_pairs(self) -> list[tuple[CookieBody, CookieBody]]:
+        """Grid candidate pairs, each once; pairs of two sleepers are skipped."""
+        cookies = self.cookies
+        grid = self._grid
+        grid.clear()
+        for c in cookies:
+            grid[(int(c.x // GRID_CELL), int(c.y // GRID_CELL))].append(c)
+
+        pairs: list[tuple[CookieBody, CookieBody]] = []
+        append = pairs.append
+        for (gx, gy), members in grid.items():
+            near = [b for ox, oy in _FORWARD_CELLS for b in grid.get((gx + ox, gy + oy), ())]
+            for k, a in enumerate(members):
+                a_asleep = a.asleep
+                for b in members[k + 1:] + near:
+                    if not (a_asleep and b.asleep):
+                        append((a, b))
+        return pairs
 
     def _render(self) -> None:
+        # One Tcl script per frame: move cookies that changed pixel, repaint waterline crossings.
+        path = self._canvas_path
+        script: list[str] = []
+        emit = script.append
         for c in self.cookies:
-            shadow_y = c.y + c.r * 0.60
-            self.canvas.coords(
-                c.shadow_id,
-                int(c.x - c.r * 0.92), int(shadow_y - c.r * 0.18),
-                int(c.x + c.r * 0.92), int(shadow_y + c.r * 0.18),
-            )
-            self.canvas.coords(
-                c.item_id,
-                int(c.x - c.r), int(c.y - c.r),
-                int(c.x + c.r), int(c.y + c.r),
-            )
-            hr = c.r * HIGHLIGHT_SCALE
-            hx = c.x + HIGHLIGHT_OFFSET[0] * c.r
-            hy = c.y + HIGHLIGHT_OFFSET[1] * c.r
-            self.canvas.coords(
-                c.highlight_id,
-                int(hx - hr), int(hy - hr), int(hx + hr), int(hy + hr),
-            )
-            self.canvas.tag_raise(c.highlight_id, c.item_id)
-
-        self.canvas.tag_lower("bowl")
+            ix = round(c.x)
+            iy = round(c.y)
+            dx = ix - c.drawn_x
+            dy = iy - c.drawn_y
+            if dx or dy:
+                emit(f"{path} move {c.tag} {dx} {dy}")
+                c.drawn_x = ix
+                c.drawn_y = iy
+
+        if self._recolor:
+            for c in self._recolor:
+                fill = self._cookie_fill(c)
+                emit(f"{path} itemconfigure {c.item_id} -fill {fill}")
+                emit(f"{path} itemconfigure {c.highlight_id} -fill {highlight_color(fill)}")
+            self._recolor.clear()
+
+        if script:
+            self.canvas.tk.eval("\n".join(script))
 
     # ---------- UI updates ----------
     def _update_defender_ui(self) -> None:
-        with self._defender_lock:
-            txt = self._defender_status_text
-            err = self._defender_last_error
-            pending = len(self._defender_pending_colors)
-            last_fetch = self._defender_last_fetch
+        now_ms = time.monotonic_ns() // 1_000_000
+        if now_ms - self._last_defender_ui_ms < UI_REFRESH_MS:
+            return
+        self._last_defender_ui_ms = now_ms
+
+        txt, err, last_fetch = self._defender_snapshot
+        pending = len(self._defender_pending_colors)
+        shown = (txt, err, pending, last_fetch)
+        if shown == self._defender_ui_shown:
+            return
+        self._defender_ui_shown = shown
 
         if err:
             self.def_label.config(text=f"{txt}\nError: {err}\nLast: {last_fetch}", foreground="#b00020")
@@ -911,10 +1217,7 @@ class App:
 
     # ---------- Fill / stats ----------
     def _fill_ratio(self) -> float:
-        filled = 0.0
-        for c in self.cookies:
-            filled += math.pi * c.r * c.r
-        return filled / max(1.0, self.collider.bowl_area)
+        return self._total_area / max(1.0, self.collider.bowl_area)
 
     def _refresh_fill_meter(self) -> None:
         ratio = self._fill_ratio()
@@ -928,11 +1231,24 @@ class App:
         else:
             self.warn_label.config(text="")
 
-    def _refresh_stats(self) -> None:
+    def _refresh_stats(self, force: bool = False) -> None:
+        # Throttled to UI_REFRESH_MS; _loop flushes whatever is left dirty.
+        self._stats_dirty = True
+        now_ms = time.monotonic_ns() // 1_000_000
+        if not force and now_ms - self._last_stats_ms < UI_REFRESH_MS:
+            return
+        self._last_stats_ms = now_ms
+        self._stats_dirty = False
+
         self.total_label.config(text=f"Total: {len(self.cookies)}")
+        self._refresh_fill_meter()
+        counts = self.counts
+        if counts == self._shown_counts:
+            return
+        self._shown_counts = dict(counts)
         self.listbox.delete(0, tk.END)
-        for color in sorted(self.counts.keys()):
-            self.listbox.insert(tk.END, f"{color:>8}  x {self.counts[color]}")
+        rows = [f"{color:>8}  x {counts[color]}" for color in self._sorted_colors]
+        self.listbox.insert(tk.END, *rows)
 
 
 def main() -> None:
@@ -942,8 +1258,9 @@ def main() -> None:
         style.theme_use("clam")
     except tk.TclError:
         pass
-    App(root)
+    app = App(root)
     root.mainloop()
+    app.shutdown()
 
 
 if __name__ == "__main__":